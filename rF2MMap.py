@@ -7,10 +7,10 @@ and cross-platform Linux support (by Bernat)
 """
 
 from __future__ import annotations
-import copy
 import ctypes
 import logging
 import mmap
+import os
 import platform
 import time
 import threading
@@ -22,11 +22,21 @@ except ImportError:  # standalone, not package
 
 PLATFORM = platform.system()
 MAX_VEHICLES = rF2data.rFactor2Constants.MAX_MAPPED_VEHICLES
+MAX_IDS = rF2data.rFactor2Constants.MAX_MAPPED_IDS
 INVALID_INDEX = -1
+VEH_SCOR_SIZE = ctypes.sizeof(rF2data.rF2VehicleScoring)
+VEH_SCOR_IS_PLAYER = rF2data.rF2VehicleScoring.mIsPlayer.offset
+VEH_TELE_SIZE = ctypes.sizeof(rF2data.rF2VehicleTelemetry)
+VEH_TELE_ID = rF2data.rF2VehicleTelemetry.mID.offset
+INT_SIZE = ctypes.sizeof(ctypes.c_int)
 
 logger = logging.getLogger(__name__)
 
 
+def skip_update() -> None:
+    """Skip update, direct access data is always up to date"""
+
+
 def platform_mmap(name: str, size: int, pid: str = "") -> mmap:
     """Platform memory mapping"""
     if PLATFORM == "Windows":
@@ -40,12 +50,18 @@ def windows_mmap(name: str, size: int, pid: str) -> mmap:
 
 
 def linux_mmap(name: str, size: int) -> mmap:
-    """Linux mmap"""
-    file = open("/dev/shm/" + name, "a+b")
-    if file.tell() == 0:
-        file.write(b"\0" * size)
-        file.flush()
-    return mmap.mmap(file.fileno(), size)
+    """Linux mmap
+
+    Extend new or undersized file with zeros via ftruncate,
+    file descriptor can be closed once mapped.
+    """
+    fd = os.open("/dev/shm/" + name, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        return mmap.mmap(fd, size)
+    finally:
+        os.close(fd)
 
 
 class RF2MMap:
@@ -67,8 +83,10 @@ class RF2MMap:
         self._mmap_name = mmap_name
         self._rf2_data = rf2_data
         self._mmap_instance = None
+        self._mmap_version = None
         self._mmap_output = None
-        self._buffer_sharing = False
+        self._buffer_size = ctypes.sizeof(rf2_data)
+        self._mmap_addr = 0
 
     def create(self, access_mode: int = 0, rf2_pid: str = "") -> None:
         """Create mmap instance & initial accessible copy
@@ -79,12 +97,16 @@ class RF2MMap:
         """
         self._mmap_instance = platform_mmap(
             name=self._mmap_name,
-            size=ctypes.sizeof(self._rf2_data),
+            size=self._buffer_size,
             pid=rf2_pid
         )
+        self._mmap_version = rF2data.rF2MappedBufferVersionBlock.from_buffer(
+            self._mmap_instance)
+        self._mmap_addr = ctypes.addressof(self._mmap_version)
         self.__buffer_copy(True)
         if access_mode:
-            self.update = self.__buffer_share
+            self.__buffer_share()
+            self.update = skip_update
         else:
             self.update = self.__buffer_copy
         mode = "Direct" if access_mode else "Copy"
@@ -96,7 +118,7 @@ class RF2MMap:
         Create a final accessible mmap data copy before closing mmap instance.
         """
         self.__buffer_copy(True)
-        self._buffer_sharing = False
+        self._mmap_version = None  # release exported pointer before closing
         try:
             self._mmap_instance.close()
             logger.info("sharedmemory: CLOSED: %s", self.mmap_id)
@@ -108,21 +130,33 @@ class RF2MMap:
         """Output mmap data"""
         return self._mmap_output
 
+    @property
+    def version(self) -> int:
+        """Output mmap data version (mVersionUpdateEnd), read from mmap"""
+        return self._mmap_version.mVersionUpdateEnd
+
     def __buffer_share(self) -> None:
         """Share buffer direct access, may result desync"""
-        if not self._buffer_sharing:
-            self._buffer_sharing = True
-            self._mmap_output = self._rf2_data.from_buffer(self._mmap_instance)
+        self._mmap_output = self._rf2_data.from_buffer(self._mmap_instance)
 
     def __buffer_copy(self, skip_check: bool = False) -> None:
-        """Copy buffer access, check version before assign new data copy
+        """Copy buffer access, check version before copy new data into buffer
+
+        Only copy if mmap data version changed and is not being written.
+        New data is copied into a new buffer, so data handed out
+        by previous update is never rewritten.
 
         Args:
             skip_check: skip data version check.
         """
-        temp = self._rf2_data.from_buffer_copy(self._mmap_instance)
-        if temp.mVersionUpdateEnd == temp.mVersionUpdateBegin or skip_check:
-            self._mmap_output = temp
+        version = self._mmap_version
+        if skip_check or (
+            version.mVersionUpdateEnd != self._mmap_output.mVersionUpdateEnd
+            and version.mVersionUpdateEnd == version.mVersionUpdateBegin
+        ):
+            buffer = self._rf2_data()
+            ctypes.memmove(ctypes.addressof(buffer), self._mmap_addr, self._buffer_size)
+            self._mmap_output = buffer
 
 
 class MMapDataSet:
@@ -133,6 +167,8 @@ class MMapDataSet:
         self._tele = RF2MMap("$rFactor2SMMP_Telemetry$", rF2data.rF2Telemetry)
         self._ext = RF2MMap("$rFactor2SMMP_Extended$", rF2data.rF2Extended)
         self._ffb = RF2MMap("$rFactor2SMMP_ForceFeedback$", rF2data.rF2ForceFeedback)
+        self._scor_version = None
+        self._tele_version = None
 
     def create_mmap(self, access_mode: int, rf2_pid: str) -> None:
         """Create mmap instance
@@ -145,6 +181,8 @@ class MMapDataSet:
         self._tele.create(access_mode, rf2_pid)
         self._ext.create(1, rf2_pid)
         self._ffb.create(1, rf2_pid)
+        self._scor_version = None
+        self._tele_version = None
 
     def close_mmap(self) -> None:
         """Close mmap instance"""
@@ -153,12 +191,28 @@ class MMapDataSet:
         self._ext.close()
         self._ffb.close()
 
-    def update_mmap(self) -> None:
-        """Update mmap data"""
-        self._scor.update()
-        self._tele.update()
-        self._ext.update()
-        self._ffb.update()
+    def update_mmap(self) -> bool:
+        """Update mmap data
+
+        Check scoring & telemetry mmap version first,
+        only update mmap data whose version changed since last update.
+        Extended & force feedback always use direct access, no update needed.
+
+        Returns:
+            True, if scoring or telemetry data version changed.
+        """
+        updated = False
+        version = self._scor.version
+        if self._scor_version != version:
+            self._scor_version = version
+            self._scor.update()
+            updated = True
+        version = self._tele.version
+        if self._tele_version != version:
+            self._tele_version = version
+            self._tele.update()
+            updated = True
+        return updated
 
     @property
     def scor(self):
@@ -181,6 +235,23 @@ class MMapDataSet:
         return self._ffb.data
 
 
+class PlayerSnapshot:
+    """Player data snapshot
+
+    Attributes:
+        scor: Player scoring data.
+        tele: Player telemetry data.
+        scor_index: Player scoring index.
+    """
+
+    __slots__ = ("scor", "tele", "scor_index")
+
+    def __init__(self) -> None:
+        self.scor = None
+        self.tele = None
+        self.scor_index = INVALID_INDEX
+
+
 class SyncData:
     """Synchronize data with player ID
 
@@ -197,29 +268,84 @@ class SyncData:
         self._updating = False
         self._update_thread = None
         self._event = threading.Event()
-        self._tele_idx_dict = {_index: _index for _index in range(128)}
+        self._data_ready = threading.Condition()
+        self._tele_idx_list = (
+            list(range(MAX_VEHICLES)) + [INVALID_INDEX] * (MAX_IDS - MAX_VEHICLES))
+        self._tele_idx_ids = None
+        self._scor_vehicles = None
+        self._tele_vehicles = None
+        self._scor_is_player = None
+        self._tele_ids = None
+        # Triple buffered player data, readers only access published snapshot
+        self._producer = PlayerSnapshot()
+        self._published = PlayerSnapshot()
+        self._retired = PlayerSnapshot()
 
         self.dataset = MMapDataSet()
         self.paused = False
         self.override_player_index = False
         self.player_scor_index = INVALID_INDEX
-        self.player_scor = None
-        self.player_tele = None
+
+    @property
+    def player_data(self) -> PlayerSnapshot:
+        """Published local player data snapshot"""
+        return self._published
+
+    @property
+    def player_scor(self) -> object:
+        """Published local player scoring data"""
+        return self._published.scor
+
+    @property
+    def player_tele(self) -> object:
+        """Published local player telemetry data"""
+        return self._published.tele
 
     def copy_player_scor(self, index: int = INVALID_INDEX) -> None:
         """Copy scoring player data from matching index"""
-        self.player_scor = copy.copy(self.dataset.scor.mVehicles[index])
+        self._producer.scor = rF2data.rF2VehicleScoring.from_buffer_copy(
+            self._scor_vehicles[index])
+        self._producer.scor_index = index
 
     def copy_player_tele(self, index: int = INVALID_INDEX) -> None:
         """Copy telemetry player data from matching index"""
-        self.player_tele = copy.copy(self.dataset.tele.mVehicles[index])
+        self._producer.tele = rF2data.rF2VehicleTelemetry.from_buffer_copy(
+            self._tele_vehicles[index])
+
+    def publish_player_data(self) -> None:
+        """Publish player data copy
+
+        Swap producer snapshot with published snapshot in a single assignment,
+        so readers always get scoring & telemetry data from the same update.
+        Retired snapshot is reused as next producer, which leaves readers
+        still holding last published snapshot a full update to finish reading.
+        """
+        self._published, self._producer, self._retired = (
+            self._producer, self._retired, self._published)
+        with self._data_ready:
+            self._data_ready.notify_all()
+
+    def wait_for_update(self, timeout: float | None = None) -> bool:
+        """Wait until next player data published
+
+        Args:
+            timeout: Max waiting time in seconds, None for no timeout.
+
+        Returns:
+            False, if timed out or not updating.
+        """
+        with self._data_ready:
+            if not self._updating:
+                return False
+            return self._data_ready.wait(timeout) and self._updating
 
     def __local_scor_index(self) -> int:
-        """Find local player scoring index"""
-        for scor_idx in range(MAX_VEHICLES):
-            if self.dataset.scor.mVehicles[scor_idx].mIsPlayer:
-                return scor_idx
-        return INVALID_INDEX
+        """Find local player scoring index
+
+        Search mIsPlayer byte column of all vehicles in a single bytes find,
+        which returns -1 (INVALID_INDEX) if player not found.
+        """
+        return self._scor_is_player.tobytes().find(1)
 
     def __sync_player_data(self) -> bool:
         """Sync local player data
@@ -229,45 +355,84 @@ class SyncData:
             True, update player data copy.
         """
         if not self.override_player_index:
-            # Update scoring index
-            scor_idx = self.__local_scor_index()
-            if scor_idx == INVALID_INDEX:
-                return False  # index not found, not synced
-            self.player_scor_index = scor_idx
+            # Update scoring index, only search if last index no longer player
+            scor_idx = self.player_scor_index
+            if scor_idx == INVALID_INDEX or not self._scor_is_player[scor_idx]:
+                scor_idx = self.__local_scor_index()
+                if scor_idx == INVALID_INDEX:
+                    return False  # index not found, not synced
+                self.player_scor_index = scor_idx
         # Copy player data
         self.copy_player_scor(self.player_scor_index)
         self.copy_player_tele(self.sync_tele_index(self.player_scor_index))
+        self.publish_player_data()
         return True  # found index, synced
 
-    def __update_tele_index_dict(self, num_vehicles: int) -> None:
-        """Update telemetry player index dictionary for quick reference
+    def __update_tele_index(self, num_vehicles: int) -> None:
+        """Update telemetry player index list for quick reference
 
         Telemetry index can be different from scoring index.
         Use mID matching to match telemetry index.
 
-        _tele_idx_dict: Telemetry mID:index reference dictionary.
+        _tele_idx_list: Telemetry index list, mID (0 to MAX_IDS - 1) as list index,
+            rebuilt as new list and replaced in one assignment,
+            so stale mIDs do not point at old slots.
+        _tele_idx_ids: All telemetry mIDs of last update in one bytes,
+            skip updating list if unchanged.
 
         Args:
-            num_vehicles: Total number of vehicles.
+            num_vehicles: Total number of vehicles, clamped to 0 - MAX_VEHICLES.
         """
-        for _index in range(num_vehicles):
-            self._tele_idx_dict[self.dataset.tele.mVehicles[_index].mID] = _index
+        if num_vehicles < 0:
+            num_vehicles = 0
+        elif num_vehicles > MAX_VEHICLES:
+            num_vehicles = MAX_VEHICLES
+        tele_ids = self._tele_ids[:num_vehicles]
+        ids = tele_ids.tobytes()
+        if self._tele_idx_ids == ids:
+            return
+        self._tele_idx_ids = ids
+        tele_idx_list = [INVALID_INDEX] * MAX_IDS
+        for _index, tele_id in enumerate(tele_ids.tolist()):
+            if 0 <= tele_id < MAX_IDS:  # skip out of range mID
+                tele_idx_list[tele_id] = _index
+        self._tele_idx_list = tele_idx_list
 
     def sync_tele_index(self, scor_idx: int) -> int:
         """Sync telemetry index
 
         Use scoring index to find scoring mID,
-        then match with telemetry mID in tele_idx_dict
+        then match with telemetry mID in tele_idx_list
         to find telemetry index.
 
         Args:
             scor_idx: Player scoring index.
 
         Returns:
-            Player telemetry index.
+            Player telemetry index, INVALID_INDEX if mID out of range.
         """
-        return self._tele_idx_dict.get(
-            self.dataset.scor.mVehicles[scor_idx].mID, INVALID_INDEX)
+        scor_id = self._scor_vehicles[scor_idx].mID
+        if 0 <= scor_id < MAX_IDS:
+            return self._tele_idx_list[scor_id]
+        return INVALID_INDEX
+
+    def __bind_vehicle_data(self) -> None:
+        """Bind scoring & telemetry vehicle data array for quick reference"""
+        self._scor_vehicles = self.dataset.scor.mVehicles
+        self._tele_vehicles = self.dataset.tele.mVehicles
+        # Strided view of scoring mIsPlayer byte from each vehicle
+        self._scor_is_player = memoryview(self._scor_vehicles).cast("B")[
+            VEH_SCOR_IS_PLAYER::VEH_SCOR_SIZE]
+        # Strided view of telemetry mID from each vehicle
+        self._tele_ids = memoryview(self._tele_vehicles).cast("B").cast("i")[
+            VEH_TELE_ID // INT_SIZE::VEH_TELE_SIZE // INT_SIZE]
+
+    def __unbind_vehicle_data(self) -> None:
+        """Unbind vehicle data array, release exported mmap pointer"""
+        self._scor_vehicles = None
+        self._tele_vehicles = None
+        self._scor_is_player = None
+        self._tele_ids = None
 
     def start(self, access_mode: int, rf2_pid: str) -> None:
         """Update & sync mmap data copy in separate thread
@@ -282,10 +447,13 @@ class SyncData:
             self._updating = True
             # Initialize mmap data
             self.dataset.create_mmap(access_mode, rf2_pid)
-            self.__update_tele_index_dict(self.dataset.tele.mNumVehicles)
+            self.__bind_vehicle_data()
+            self._tele_idx_ids = None
+            self.__update_tele_index(self.dataset.tele.mNumVehicles)
             if not self.__sync_player_data():
                 self.copy_player_scor()
                 self.copy_player_tele()
+                self.publish_player_data()
             # Setup updating thread
             self._event.clear()
             self._update_thread = threading.Thread(target=self.__update, daemon=True)
@@ -300,7 +468,11 @@ class SyncData:
             self._event.set()
             self._updating = False
             self._update_thread.join()
+            with self._data_ready:
+                self._data_ready.notify_all()  # wake up waiting readers
+            self.__unbind_vehicle_data()
             self.dataset.close_mmap()
+            self.__bind_vehicle_data()  # bind to final data copy
         else:
             logger.warning("sharedmemory: UPDATING: already stopped")
 
@@ -311,34 +483,54 @@ class SyncData:
         last_version_update = 0  # store last update version number
         last_update_time = 0
         data_freezed = True  # whether data is freezed
-        reset_counter = 0
+        player_lost_time = 0.0  # time when local player index lost
         update_delay = 0.5  # longer delay while inactive
 
-        while not self._event.wait(update_delay):
-            self.dataset.update_mmap()
-            self.__update_tele_index_dict(self.dataset.tele.mNumVehicles)
-            # Update player data & index
+        # Local references
+        wait = self._event.wait
+        monotonic = time.monotonic
+        update_mmap = self.dataset.update_mmap
+        bind_vehicle_data = self.__bind_vehicle_data
+        update_tele_index = self.__update_tele_index
+        sync_player_data = self.__sync_player_data
+        scor_data = self.dataset.scor
+        tele_data = self.dataset.tele
+
+        while not wait(update_delay):
+            data_updated = update_mmap()
+            if data_updated:
+                # Copy access outputs new data copy on update, rebind if changed
+                if scor_data is not self.dataset.scor or tele_data is not self.dataset.tele:
+                    scor_data = self.dataset.scor
+                    tele_data = self.dataset.tele
+                    bind_vehicle_data()
+                update_tele_index(self.dataset.tele.mNumVehicles)
+            # Back off update delay while active but data unchanged
             if not data_freezed:
+                if data_updated:
+                    update_delay = 0.005
+                elif update_delay < 0.05:
+                    update_delay = min(update_delay * 2, 0.05)
+            # Update player data & index
+            if not data_freezed and data_updated:
                 # Get player data
-                data_synced = self.__sync_player_data()
-                # Pause if local player index no longer exists, 5 tries
+                data_synced = sync_player_data()
+                # Pause if local player index no longer exists after 0.05s
                 if data_synced:
-                    reset_counter = 0
+                    player_lost_time = 0.0
                     self.paused = False
-                else:
-                    if reset_counter < 6:
-                        reset_counter += 1
-                        # Activate pause
-                        if reset_counter == 5:
-                            self.paused = True
-                            logger.info("sharedmemory: UPDATING: player data paused")
-
-            if last_version_update != self.dataset.scor.mVersionUpdateEnd:
-                last_update_time = time.time()
-                last_version_update = self.dataset.scor.mVersionUpdateEnd
+                elif not player_lost_time:
+                    player_lost_time = monotonic()
+                elif not self.paused and monotonic() - player_lost_time > 0.05:
+                    self.paused = True
+                    logger.info("sharedmemory: UPDATING: player data paused")
+
+            if last_version_update != scor_data.mVersionUpdateEnd:
+                last_update_time = monotonic()
+                last_version_update = scor_data.mVersionUpdateEnd
 
             # Set freeze state if data stopped updating after 2s
-            if not data_freezed and time.time() - last_update_time > 2:
+            if not data_freezed and monotonic() - last_update_time > 2:
                 update_delay = 0.5
                 data_freezed = True
                 self.paused = True
@@ -347,7 +539,7 @@ class SyncData:
                     "sharedmemory: UPDATING: paused, data version %s", freezed_version)
 
             if data_freezed and freezed_version != last_version_update:
-                update_delay = 0.01
+                update_delay = 0.005
                 data_freezed = False
                 self.paused = False
                 logger.info(
@@ -363,6 +555,7 @@ class RF2SM:
         self._sync = SyncData()
         self._access_mode = 0
         self._rf2_pid = ""
+        self._dataset = self._sync.dataset
 
     def start(self) -> None:
         """Start data updating thread"""
@@ -390,12 +583,27 @@ class RF2SM:
 
     def setPlayerIndex(self, index: int = INVALID_INDEX) -> None:
         """Manual override player index"""
-        self._sync.player_scor_index = min(max(index, INVALID_INDEX), MAX_VEHICLES - 1)
+        if index < INVALID_INDEX:
+            index = INVALID_INDEX
+        elif index >= MAX_VEHICLES:
+            index = MAX_VEHICLES - 1
+        self._sync.player_scor_index = index
+
+    def waitForUpdate(self, timeout: float | None = None) -> bool:
+        """Wait until next local player data update
+
+        Args:
+            timeout: Max waiting time in seconds, None for no timeout.
+
+        Returns:
+            False, if timed out or not updating.
+        """
+        return self._sync.wait_for_update(timeout)
 
     @property
     def rf2ScorInfo(self) -> object:
         """rF2 scoring info data"""
-        return self._sync.dataset.scor.mScoringInfo
+        return self._dataset.scor.mScoringInfo
 
     def rf2ScorVeh(self, index: int | None = None) -> object:
         """rF2 scoring vehicle data
@@ -407,7 +615,7 @@ class RF2SM:
         """
         if index is None:
             return self._sync.player_scor
-        return self._sync.dataset.scor.mVehicles[index]
+        return self._dataset.scor.mVehicles[index]
 
     def rf2TeleVeh(self, index: int | None = None) -> object:
         """rF2 telemetry vehicle data
@@ -419,17 +627,42 @@ class RF2SM:
         """
         if index is None:
             return self._sync.player_tele
-        return self._sync.dataset.tele.mVehicles[self._sync.sync_tele_index(index)]
+        return self._dataset.tele.mVehicles[self._sync.sync_tele_index(index)]
+
+    def rf2PlayerData(self) -> tuple:
+        """rF2 local player data from the same update
+
+        Returns:
+            Player scoring data, telemetry data, scoring index.
+        """
+        snapshot = self._sync.player_data
+        return snapshot.scor, snapshot.tele, snapshot.scor_index
+
+    def rf2PlayerScor(self) -> object:
+        """rF2 local player scoring vehicle data"""
+        return self._sync.player_scor
+
+    def rf2PlayerTele(self) -> object:
+        """rF2 local player telemetry vehicle data"""
+        return self._sync.player_tele
+
+    def rf2ScorVehAt(self, index: int) -> object:
+        """rF2 scoring vehicle data at scoring index"""
+        return self._dataset.scor.mVehicles[index]
+
+    def rf2TeleVehAt(self, index: int) -> object:
+        """rF2 telemetry vehicle data matching scoring index"""
+        return self._dataset.tele.mVehicles[self._sync.sync_tele_index(index)]
 
     @property
     def rf2Ext(self) -> object:
         """rF2 extended data"""
-        return self._sync.dataset.ext
+        return self._dataset.ext
 
     @property
     def rf2Ffb(self) -> object:
         """rF2 force feedback data"""
-        return self._sync.dataset.ffb
+        return self._dataset.ffb
 
     @property
     def playerIndex(self) -> int:
@@ -440,7 +673,7 @@ class RF2SM:
         """Check whether index is player"""
         if self._sync.override_player_index:
             return self._sync.player_scor_index == index
-        return self._sync.dataset.scor.mVehicles[index].mIsPlayer
+        return self._dataset.scor.mVehicles[index].mIsPlayer
 
     @property
     def isPaused(self) -> bool:
@@ -4,6 +4,8 @@ and add access functions to it.
 """
 # pylint: disable=invalid-name
 
+import ctypes
+
 import psutil
 
 try:
@@ -25,19 +27,43 @@ class SimInfoAPI(rF2data.SimInfo):
     rf2_pid = None          # Once we've found rF2 running
     rf2_pid_counter = 0     # Counter to check if running
     rf2_running = False
+    __versionKey = None     # Version fields of last versionCheck
+    __versionMsg = ''
+    __versionVerified = False
 
     def __init__(self):
         rF2data.SimInfo.__init__(self)
+        # mIsPlayer byte of each scoring vehicle, as one strided column
+        self.__isPlayerColumn = memoryview(self.Rf2Scor.mVehicles).cast('B')[
+            rF2data.rF2VehicleScoring.mIsPlayer.offset::
+            ctypes.sizeof(rF2data.rF2VehicleScoring)]
         self.versionCheckMsg = self.versionCheck()
         self.__find_rf2_pid()
 
     def versionCheck(self):
+        """
+        Check shared memory version, only parsed again
+        if any of the version related Extended fields changed.
+        """
+        versionKey = (self.Rf2Ext.mVersion,
+                      self.Rf2Ext.is64bit,
+                      self.Rf2Ext.mDirectMemoryAccessEnabled,
+                      self.Rf2Ext.mSCRPluginEnabled,
+                      self.Rf2Ext.mSCRPluginDoubleFileType)
+        if versionKey != self.__versionKey:
+            self.__versionKey = versionKey
+            self.__versionMsg = self.__parseVersion()
+            self.__versionVerified = self.sharedMemoryVerified
+        self.sharedMemoryVerified = self.__versionVerified
+        return self.__versionMsg
+
+    def __parseVersion(self):
         """
         Lifted from
         https://gitlab.com/mr_belowski/CrewChiefV4/blob/master/CrewChiefV4/RF2/RF2GameStateMapper.cs
         and translated.
         """
-        self.sharedMemoryVerified = False    # Verify every time it is called.
+        self.sharedMemoryVerified = False    # Verify every time it is parsed.
 
         versionStr = Cbytestring2Python(self.Rf2Ext.mVersion)
         msg = ''
@@ -103,9 +129,9 @@ class SimInfoAPI(rF2data.SimInfo):
 
     def __playersDriverNum(self):
         """ Find the player's driver number """
-        for _player in range(50):  # self.Rf2Tele.mVehicles[0].mNumVehicles:
-            if self.Rf2Scor.mVehicles[_player].mIsPlayer:
-                break
+        _player = self.__isPlayerColumn[:50].tobytes().find(1)
+        if _player < 0:  # not found, last checked
+            _player = 49
         return _player
 
     ###########################################################
@@ -183,12 +209,10 @@ class SimInfoAPI(rF2data.SimInfo):
 
     def playersVehicleTelemetry(self):
         """ Get the variable for the player's vehicle """
-        self.__playersDriverNum()
         return self.Rf2Tele.mVehicles[self.__playersDriverNum()]
 
     def playersVehicleScoring(self):
         """ Get the variable for the player's vehicle """
-        self.__playersDriverNum()
         return self.Rf2Scor.mVehicles[self.__playersDriverNum()]
 
     def vehicleName(self):
@@ -215,17 +239,17 @@ def Cbytestring2Python(bytestring):
     """
     C string to Python string
     """
-    try:
-        return bytes(bytestring).partition(b'\0')[0].decode('utf_8').rstrip()
+    try:    # Copy & truncate once, reused by every decoding attempt
+        bytestring = bytes(bytestring).partition(b'\0')[0]
+        return bytestring.decode('utf_8').rstrip()
     except BaseException:
         pass
     try:    # Codepage 1252 includes Scandinavian characters
-        return bytes(bytestring).partition(b'\0')[0].decode('cp1252').rstrip()
+        return bytestring.decode('cp1252').rstrip()
     except BaseException:
         pass
     try:    # OK, struggling, just ignore errors
-        return bytes(bytestring).partition(b'\0')[
-            0].decode('utf_8', 'ignore').rstrip()
+        return bytestring.decode('utf_8', 'ignore').rstrip()
     except Exception as e:
         print('Trouble decoding a string')
         print(e)
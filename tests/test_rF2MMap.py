@@ -0,0 +1,343 @@
+import ctypes
+import os
+import platform
+import threading
+import time
+import unittest
+
+import rF2data
+from rF2MMap import (RF2SM, RF2MMap, SyncData, linux_mmap,
+                     INVALID_INDEX, MAX_IDS, MAX_VEHICLES)
+
+TEST_PREFIX = '$rF2MMapTest%s_' % os.getpid()
+SCOR_NAME = TEST_PREFIX + 'Scoring$'
+TELE_NAME = TEST_PREFIX + 'Telemetry$'
+EXT_NAME = TEST_PREFIX + 'Extended$'
+FFB_NAME = TEST_PREFIX + 'ForceFeedback$'
+
+
+def use_test_names(dataset):
+    """Point data set at test mmap names, so no live session is touched"""
+    dataset._scor._mmap_name = SCOR_NAME
+    dataset._tele._mmap_name = TELE_NAME
+    dataset._ext._mmap_name = EXT_NAME
+    dataset._ffb._mmap_name = FFB_NAME
+
+
+def unlink_test_names():
+    for name in (SCOR_NAME, TELE_NAME, EXT_NAME, FFB_NAME):
+        try:
+            os.unlink('/dev/shm/' + name)
+        except FileNotFoundError:
+            pass
+
+
+class FakeWriter:
+    """Writer side of scoring & telemetry memory map"""
+
+    def __init__(self):
+        self.mmaps = [
+            linux_mmap(SCOR_NAME, ctypes.sizeof(rF2data.rF2Scoring)),
+            linux_mmap(TELE_NAME, ctypes.sizeof(rF2data.rF2Telemetry)),
+        ]
+        self.scor = rF2data.rF2Scoring.from_buffer(self.mmaps[0])
+        self.tele = rF2data.rF2Telemetry.from_buffer(self.mmaps[1])
+        ctypes.memset(ctypes.addressof(self.scor), 0, ctypes.sizeof(self.scor))
+        ctypes.memset(ctypes.addressof(self.tele), 0, ctypes.sizeof(self.tele))
+        self.version = 0
+
+    def write(self, scor_ids, tele_ids, num_vehicles=None, player=INVALID_INDEX):
+        """Write vehicle mIDs as one complete update"""
+        self.version += 1
+        for data in (self.scor, self.tele):
+            data.mVersionUpdateBegin = self.version
+        for index, mid in enumerate(scor_ids):
+            self.scor.mVehicles[index].mID = mid
+            self.scor.mVehicles[index].mIsPlayer = index == player
+        for index, mid in enumerate(tele_ids):
+            self.tele.mVehicles[index].mID = mid
+        if num_vehicles is None:
+            num_vehicles = len(tele_ids)
+        self.scor.mScoringInfo.mNumVehicles = len(scor_ids)
+        self.tele.mNumVehicles = num_vehicles
+        for data in (self.scor, self.tele):
+            data.mVersionUpdateEnd = self.version
+
+    def close(self):
+        self.scor = self.tele = None
+        for writer_mmap in self.mmaps:
+            writer_mmap.close()
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'requires /dev/shm')
+class Test_linux_mmap(unittest.TestCase):
+    def tearDown(self):
+        unlink_test_names()
+
+    def test_new_file_extended(self):
+        linux_mmap(SCOR_NAME, 1000).close()
+        self.assertEqual(os.path.getsize('/dev/shm/' + SCOR_NAME), 1000)
+
+    def test_undersized_file_extended(self):
+        small = linux_mmap(SCOR_NAME, 10)
+        small[:3] = b'abc'
+        small.close()
+        large = linux_mmap(SCOR_NAME, 1000)
+        self.assertEqual(large[:3], b'abc')
+        large.close()
+        self.assertEqual(os.path.getsize('/dev/shm/' + SCOR_NAME), 1000)
+
+    def test_larger_file_not_truncated(self):
+        linux_mmap(SCOR_NAME, 1000).close()
+        linux_mmap(SCOR_NAME, 10).close()
+        self.assertEqual(os.path.getsize('/dev/shm/' + SCOR_NAME), 1000)
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'requires /dev/shm')
+class Test_RF2MMap_copy_access(unittest.TestCase):
+    def setUp(self):
+        self.writer = FakeWriter()
+        self.mmap = RF2MMap(SCOR_NAME, rF2data.rF2Scoring)
+
+    def tearDown(self):
+        self.mmap.close()
+        self.writer.close()
+        unlink_test_names()
+
+    def write_name(self, name):
+        self.writer.write([1], [1])
+        self.writer.scor.mVehicles[0].mDriverName = name
+
+    def test_unchanged_version_not_copied(self):
+        self.mmap.create(0)
+        data = self.mmap.data
+        self.mmap.update()
+        self.assertIs(self.mmap.data, data)
+
+    def test_changed_version_copied(self):
+        self.mmap.create(0)
+        self.write_name(b'AAA')
+        self.mmap.update()
+        self.assertEqual(self.mmap.data.mVehicles[0].mDriverName, b'AAA')
+        self.assertEqual(self.mmap.data.mVersionUpdateEnd, self.writer.version)
+
+    def test_partial_write_not_copied(self):
+        self.mmap.create(0)
+        self.write_name(b'AAA')
+        self.mmap.update()
+        data = self.mmap.data
+        self.writer.scor.mVersionUpdateBegin += 1  # writer still writing
+        self.writer.scor.mVersionUpdateEnd -= 1
+        self.writer.scor.mVehicles[0].mDriverName = b'BBB'
+        self.mmap.update()
+        self.assertIs(self.mmap.data, data)
+        self.assertEqual(data.mVehicles[0].mDriverName, b'AAA')
+
+    def test_held_data_not_rewritten(self):
+        self.mmap.create(0)
+        held = []
+        for name in (b'AAA', b'BBB', b'CCC', b'DDD'):
+            self.write_name(name)
+            self.mmap.update()
+            held.append(self.mmap.data.mVehicles[0])
+        self.assertEqual([veh.mDriverName for veh in held],
+                         [b'AAA', b'BBB', b'CCC', b'DDD'])
+
+    def test_direct_access_shared(self):
+        self.mmap.create(1)
+        data = self.mmap.data
+        self.write_name(b'AAA')
+        self.mmap.update()
+        self.assertIs(self.mmap.data, data)
+        self.assertEqual(data.mVehicles[0].mDriverName, b'AAA')
+        data = None  # release exported pointer before closing
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'requires /dev/shm')
+class Test_MMapDataSet_version(unittest.TestCase):
+    def setUp(self):
+        self.writer = FakeWriter()
+        self.sync = SyncData()
+        use_test_names(self.sync.dataset)
+        self.sync.dataset.create_mmap(0, '')
+
+    def tearDown(self):
+        self.sync.dataset.close_mmap()
+        self.writer.close()
+        unlink_test_names()
+
+    def test_update_only_on_version_change(self):
+        dataset = self.sync.dataset
+        self.writer.write([1], [1])
+        self.assertTrue(dataset.update_mmap())
+        self.assertFalse(dataset.update_mmap())
+        self.writer.tele.mVersionUpdateBegin += 1
+        self.writer.tele.mVersionUpdateEnd += 1
+        scor = dataset.scor
+        self.assertTrue(dataset.update_mmap())
+        self.assertIs(dataset.scor, scor)
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'requires /dev/shm')
+class Test_rF2MMap_tele_index(unittest.TestCase):
+    def setUp(self):
+        self.writer = FakeWriter()
+        self.sync = SyncData()
+        use_test_names(self.sync.dataset)
+        self.sync.dataset.create_mmap(0, '')
+
+    def tearDown(self):
+        self.sync._SyncData__unbind_vehicle_data()
+        self.sync.dataset.close_mmap()
+        self.writer.close()
+        unlink_test_names()
+
+    def write(self, scor_ids, tele_ids, num_vehicles=None):
+        """Write vehicle mIDs as one update, then rebuild telemetry index"""
+        self.writer.write(scor_ids, tele_ids, num_vehicles)
+        assert self.sync.dataset.update_mmap()
+        self.sync._SyncData__bind_vehicle_data()
+        self.sync._SyncData__update_tele_index(self.sync.dataset.tele.mNumVehicles)
+
+    def tele_index(self, mid):
+        return self.sync._tele_idx_list[mid]
+
+    def test_reversed_order(self):
+        self.write([10, 11, 12, 13], [13, 12, 11, 10])
+        for scor_idx in range(4):
+            self.assertEqual(self.sync.sync_tele_index(scor_idx), 3 - scor_idx)
+
+    def test_changed_middle_id(self):
+        self.write([1, 2, 3, 4, 5], [1, 2, 3, 4, 5])
+        self.write([1, 2, 9, 4, 5], [1, 2, 9, 4, 5])
+        self.assertEqual(self.sync.sync_tele_index(2), 2)
+        self.assertEqual(self.tele_index(3), INVALID_INDEX)
+
+    def test_reordered_inner_ids(self):
+        self.write([1, 2, 3, 4, 5], [1, 2, 3, 4, 5])
+        self.write([1, 2, 3, 4, 5], [1, 4, 3, 2, 5])
+        self.assertEqual(self.sync.sync_tele_index(1), 3)
+        self.assertEqual(self.sync.sync_tele_index(3), 1)
+
+    def test_replaced_inner_id(self):
+        self.write([1, 2, 3, 4, 5], [1, 2, 3, 4, 5])
+        self.write([1, 9, 3, 4, 5], [1, 9, 3, 4, 5])
+        self.assertEqual(self.sync.sync_tele_index(1), 1)
+        self.assertEqual(self.tele_index(2), INVALID_INDEX)
+
+    def test_rebuild_publishes_new_list(self):
+        self.write([1, 2], [2, 1])
+        old_list = self.sync._tele_idx_list
+        old_values = list(old_list)
+        self.write([1, 3], [3, 1])
+        self.assertIsNot(self.sync._tele_idx_list, old_list)
+        self.assertEqual(old_list, old_values)
+        self.assertEqual(self.tele_index(3), 0)
+
+    def test_zero_vehicles(self):
+        self.write([7, 8], [8, 7])
+        self.assertEqual(self.tele_index(7), 1)
+        self.write([], [])
+        self.assertEqual(self.tele_index(7), INVALID_INDEX)
+        self.assertEqual(self.tele_index(8), INVALID_INDEX)
+
+    def test_large_ids(self):
+        self.write([128, 300, 511], [511, 128, 300])
+        self.assertEqual(self.sync.sync_tele_index(0), 1)
+        self.assertEqual(self.sync.sync_tele_index(1), 2)
+        self.assertEqual(self.sync.sync_tele_index(2), 0)
+
+    def test_out_of_range_ids(self):
+        self.write([MAX_IDS + 1, -1, 1], [1, MAX_IDS + 1, -1])
+        self.assertEqual(self.tele_index(1), 0)
+        self.assertEqual(self.sync._tele_idx_list.count(INVALID_INDEX), MAX_IDS - 1)
+        self.assertEqual(self.sync.sync_tele_index(0), INVALID_INDEX)
+        self.assertEqual(self.sync.sync_tele_index(1), INVALID_INDEX)
+
+    def test_invalid_vehicle_count(self):
+        self.write([5, 6], [6, 5], num_vehicles=-1)
+        self.assertEqual(self.tele_index(5), INVALID_INDEX)
+        self.write([5, 6], [6, 5], num_vehicles=MAX_VEHICLES + 10)
+        self.assertEqual(self.sync.sync_tele_index(0), 1)
+        self.assertEqual(self.sync.sync_tele_index(1), 0)
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'requires /dev/shm')
+class Test_RF2SM(unittest.TestCase):
+    NUM_VEHICLES = 6
+    PLAYER = 3
+
+    def setUp(self):
+        self.writer = FakeWriter()
+        self.writing = threading.Event()
+        self.writer_thread = None
+        self.info = RF2SM()
+        use_test_names(self.info._sync.dataset)
+
+    def tearDown(self):
+        if self.info._sync._updating:
+            self.info.stop()
+        self.stop_writer()
+        self.writer.close()
+        unlink_test_names()
+
+    def start_writer(self):
+        """Write scoring in order, telemetry in reversed order every 5ms"""
+        scor_ids = [10 + index for index in range(self.NUM_VEHICLES)]
+        tele_ids = scor_ids[::-1]
+
+        def write():
+            while self.writing.is_set():
+                self.writer.write(scor_ids, tele_ids, player=self.PLAYER)
+                time.sleep(0.005)
+
+        self.writing.set()
+        self.writer_thread = threading.Thread(target=write, daemon=True)
+        self.writer_thread.start()
+
+    def stop_writer(self):
+        if self.writer_thread:
+            self.writing.clear()
+            self.writer_thread.join()
+            self.writer_thread = None
+
+    def test_wait_before_start(self):
+        self.assertFalse(self.info.waitForUpdate(None))
+
+    def test_player_data_snapshot(self):
+        self.start_writer()
+        self.info.start()
+        self.assertTrue(self.info.waitForUpdate(2))
+        self.assertTrue(self.info.waitForUpdate(2))
+        scor, tele, scor_index = self.info.rf2PlayerData()
+        self.assertEqual(scor_index, self.PLAYER)
+        self.assertEqual(scor.mID, 10 + self.PLAYER)
+        self.assertEqual(tele.mID, scor.mID)
+        self.assertEqual(self.info.rf2TeleVeh(0).mID, 10)
+
+    def test_wait_woken_by_stop(self):
+        self.start_writer()
+        self.info.start()
+        self.assertTrue(self.info.waitForUpdate(2))
+        self.stop_writer()  # no more updates
+        result = []
+        waiter = threading.Thread(
+            target=lambda: result.append(self.info.waitForUpdate(None)), daemon=True)
+        waiter.start()
+        waiter.join(0.2)
+        self.info.stop()
+        waiter.join(2)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(result, [False])
+        self.assertFalse(self.info.waitForUpdate(None))
+
+    def test_override_player_index(self):
+        self.info.setPlayerOverride(True)
+        self.info.setPlayerIndex(5)
+        self.assertEqual(self.info.playerIndex, 5)
+        self.assertTrue(self.info.isPlayer(5))
+        self.assertFalse(self.info.isPlayer(0))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -50,6 +50,27 @@ class Test_sharedMemoryAPI(unittest.TestCase):
         info.Rf2Ext.mInRealtimeFC = 1
         assert info.isOnTrack()
 
+    def test_version_check_cached(self):
+        info = SimInfoAPI()
+        info.Rf2Ext.mVersion = VERSION_STRING.encode()
+        info.Rf2Ext.is64bit = 1
+        parsed = []
+        parseVersion = info._SimInfoAPI__parseVersion
+
+        def countingParse():
+            parsed.append(1)
+            return parseVersion()
+        info._SimInfoAPI__parseVersion = countingParse
+        msg = info.versionCheck()
+        assert info.sharedMemoryVerified
+        assert info.versionCheck() == msg
+        assert info.sharedMemoryVerified
+        assert len(parsed) == 1
+        info.Rf2Ext.is64bit = 0
+        assert 'Only 64bit' in info.versionCheck()
+        assert not info.sharedMemoryVerified
+        assert len(parsed) == 2
+
 
 if __name__ == '__main__':
     unittest.main(exit=False)